@@ -1,39 +1,62 @@
 """Case restorer main."""
 
 import argparse
+import array
 import collections
 import logging
+import multiprocessing
 import random
 import operator
 
-from typing import Counter, DefaultDict, List, Tuple
+from typing import Counter, DefaultDict, Dict, Iterable, List, Tuple
 
 import nlup  # type: ignore
 
+from feature_encoding import EncodedVectors, encode_vectors
 
-from .case import MixedPatternTable, TokenCase
-from .model import CaseRestorer
+from .case import MixedPatternTable, clear_tc_memo
+from .model import CaseRestorer, Patterns, Vectors
 
 
 Tokens = List[str]
-Tags = List[TokenCase]
-Sentences = List[Tuple[Tokens, Tags]]
-
-
-def _read_data(filename: str) -> Tuple[Sentences, MixedPatternTable]:
+Tags = array.array
+Sentences = List[Tuple[EncodedVectors, Tags]]
+
+
+def _read_data(
+    filename: str, jobs: int = 1
+) -> Tuple[Sentences, MixedPatternTable]:
+    source: Iterable[Tuple[Tuple[Tokens, Tags, Patterns], Vectors]]
+    if jobs > 1:
+        # Feature extraction is pure Python, so it is spread across processes
+        # rather than threads.
+        sentences = list(CaseRestorer.tagged_sentences_from_file(filename))
+        with multiprocessing.Pool(jobs) as pool:
+            vector_lists = pool.map(
+                CaseRestorer.extract_emission_features,
+                [tokens for (tokens, _, _) in sentences],
+                chunksize=0x100,
+            )
+        source = zip(sentences, vector_lists)
+    else:
+        source = (
+            (sentence, CaseRestorer.extract_emission_features(sentence[0]))
+            for sentence in CaseRestorer.tagged_sentences_from_file(filename)
+        )
     data = []
+    # The case-folded context features are shared by every casing of a word,
+    # so each is encoded once for the data set and reused on every epoch.
+    memo: Dict[str, bytes] = {}
     mixed_pattern_counts: DefaultDict[str, Counter] = collections.defaultdict(
         collections.Counter
     )
-    gen = CaseRestorer.tagged_sentences_from_file(filename)
-    for (tokens, tags, patterns) in gen:
-        vectors = CaseRestorer.extract_emission_features(tokens)
-        data.append((vectors, tags))
+    for ((tokens, tags, patterns), vectors) in source:
+        data.append((encode_vectors(vectors, memo), tags))
         for (token, pattern) in zip(tokens, patterns):
             if pattern is not None:
-                mixed_pattern_counts[token][tuple(pattern)] += 1
+                mixed_pattern_counts[token][pattern] += 1
     mixed_patterns = {
-        token: list(max(inner.items(), key=operator.itemgetter(1))[0])
+        token: max(inner.items(), key=operator.itemgetter(1))[0]
         for (token, inner) in mixed_pattern_counts.items()
     }
     return (data, mixed_patterns)
@@ -81,6 +104,12 @@ argparser.add_argument(
     help="margin constant (default: %(default)s)",
 )
 argparser.add_argument("--seed", type=int, default=0, help="random seed")
+argparser.add_argument(
+    "--jobs",
+    type=int,
+    default=1,
+    help="number of processes for feature extraction (default: %(default)s)",
+)
 args = argparser.parse_args()
 
 # Verbosity block.
@@ -92,19 +121,24 @@ else:
 # Input block.
 if args.train:
     logging.info("Training model from %s", args.train)
-    (train_sents, train_mpt) = _read_data(args.train)
+    (train_sents, train_mpt) = _read_data(args.train, args.jobs)
     train_size = _data_size(train_sents)
     if args.dev:
-        dev_sents = _read_data(args.dev)[0]
+        dev_sents = _read_data(args.dev, args.jobs)[0]
         dev_size = _data_size(dev_sents)
+    # The token casing memo is only needed while reading data.
+    clear_tc_memo()
     model = CaseRestorer(args.nfeats, args.order, args.c, train_mpt)
     random.seed(args.seed)
+    # Shuffles the indices rather than the data itself.
+    order = list(range(len(train_sents)))
     for epoch in range(1, 1 + args.epochs):
-        random.shuffle(train_sents)
+        random.shuffle(order)
         logging.info("Epoch %d...", epoch)
         train_correct = 0
         with nlup.Timer():
-            for (vectors, tags) in train_sents:
+            for index in order:
+                (vectors, tags) = train_sents[index]
                 train_correct += model.train(vectors, tags)
         logging.info(
             "Resubstitution accuracy: %.4f", train_correct / train_size
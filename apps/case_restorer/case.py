@@ -6,9 +6,11 @@ to an arbitrary Unicode string)."""
 
 
 import enum
+import functools
+import re
 import unicodedata
 
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Optional, Tuple
 
 
 # Casing features at the the Unicode character level.
@@ -22,7 +24,7 @@ class CharCase(enum.IntEnum):
     LOWER = 1  # Unicode category 'Ll'.
     UPPER = 2  # Unicode category 'Lu'.
 
-    def __str__(self):
+    def __str__(self) -> str:
         return self.name
 
 
@@ -31,6 +33,47 @@ class UnknownCharCaseError(ValueError):
     pass
 
 
+def _category_cc(nunichar: str) -> CharCase:
+    catstr = unicodedata.category(nunichar)
+    if catstr == "Ll":
+        return CharCase.LOWER
+    elif catstr == "Lu":
+        return CharCase.UPPER
+    else:
+        return CharCase.DC
+
+
+# CharCase values for ASCII characters, indexed by codepoint. This is padded
+# to 256 entries so that it can also serve as a `bytes.translate` table.
+_ASCII_CC: bytes = bytes(
+    _category_cc(chr(codepoint)) for codepoint in range(128)
+) + bytes(128)
+
+# Memoized CharCase values for non-ASCII characters, keyed by codepoint.
+_NONASCII_CC: Dict[int, int] = {}
+
+
+def _get_cc_value(nunichar: str) -> int:
+    """Computes the integral CharCase value for a Unicode character.
+
+    ASCII characters are looked up in a table; all others are classified by
+    Unicode category and memoized.
+
+    Args:
+        nunichar: A Unicode character whose casing is to be computed.
+
+    Returns:
+        The integral CharCase value for the input character.
+    """
+    codepoint = ord(nunichar)
+    if codepoint < 128:
+        return _ASCII_CC[codepoint]
+    value = _NONASCII_CC.get(codepoint)
+    if value is None:
+        value = _NONASCII_CC[codepoint] = _category_cc(nunichar)
+    return value
+
+
 def get_cc(nunichar: str) -> CharCase:
     """Computes CharCase for a Unicode character.
 
@@ -42,13 +85,7 @@ def get_cc(nunichar: str) -> CharCase:
     Returns:
       The CharCase for the input character.
     """
-    catstr = unicodedata.category(nunichar)
-    if catstr == "Ll":
-        return CharCase.LOWER
-    elif catstr == "Lu":
-        return CharCase.UPPER
-    else:
-        return CharCase.DC
+    return CharCase(_get_cc_value(nunichar))
 
 
 def apply_cc(nunichar: str, cc: CharCase) -> str:
@@ -90,7 +127,7 @@ class TokenCase(enum.IntEnum):
     TITLE = 3  # [Lu] ([Ll] | [DC])*
     MIXED = 4  # All others.
 
-    def __str__(self):
+    def __str__(self) -> str:
         return self.name
 
 
@@ -102,38 +139,163 @@ class UnknownTokenCaseError(ValueError):
 # Type definitions for mixed-base patterns.
 
 
-ObligatoryPattern = List[CharCase]
+ObligatoryPattern = bytes
 Pattern = Optional[ObligatoryPattern]
 MixedPatternTable = Dict[str, ObligatoryPattern]
 
 
+# Matches a CharCase pattern which violates the `str.istitle` definition of
+# titlecase: an uppercase character following a cased character, or a
+# lowercase character following an uncased character (or nothing at all).
+_NONTITLE = re.compile(rb"[\x01\x02]\x02|(?:^|\x00)\x01")
+
+
+def _classify(nunistr: str) -> ObligatoryPattern:
+    """Computes the CharCase of each character in a Unicode string.
+
+    Args:
+        nunistr: A Unicode string whose characters are to be classified.
+
+    Returns:
+        A bytestring of CharCase values, one per input character.
+    """
+    # ASCII strings are classified in a single pass in C.
+    if nunistr.isascii():
+        return nunistr.encode("ascii").translate(_ASCII_CC)
+    return bytes(_get_cc_value(nunichr) for nunichr in nunistr)
+
+
+# Memoized results of `get_tc`, keyed by string.
+_TC_MEMO: Dict[str, Tuple[TokenCase, Pattern]] = {}
+
+
 def get_tc(nunistr: str) -> Tuple[TokenCase, Pattern]:
     """Computes TokenCase for a Unicode string.
 
-    This function computes the TokenCase of a Unicode character.
+    This function computes the TokenCase of a Unicode string. Each character
+    is classified exactly once; the TokenCase is then derived from the
+    resulting pattern. Results are memoized; see `clear_tc_memo`.
 
     Args:
         nunistr: A Unicode string whose casing is to be computed.
 
     Returns:
-        A list consisting of the TokenCase for the input character, and either
-        None (representing "n/a") or a list of CharCase instances representing
-        the specifics of a `MIXED` TokenCase pattern.
+        A tuple consisting of the TokenCase for the input string, and either
+        None (representing "n/a") or a bytestring of CharCase values
+        representing the specifics of a `MIXED` TokenCase pattern.
     """
-    if nunistr.islower():
-        return (TokenCase.LOWER, None)
+    result = _TC_MEMO.get(nunistr)
+    if result is None:
+        result = _TC_MEMO[nunistr] = _compute_tc(nunistr)
+    return result
+
+
+def clear_tc_memo() -> None:
+    """Releases the memoized results of `get_tc`."""
+    _TC_MEMO.clear()
+
+
+@functools.lru_cache(maxsize=None)
+def _is_irregular(nunichar: str) -> bool:
+    """Determines whether a character is cased but neither 'Ll' nor 'Lu'.
+
+    This holds for titlecase ('Lt') letters like "ǅ" and for characters like
+    "Ⅻ", "Ⓐ", and "ª", which are cased but not letters of either category.
+    """
+    if unicodedata.category(nunichar) in ("Ll", "Lu"):
+        return False
+    return nunichar.isupper() or nunichar.islower() or nunichar.istitle()
+
+
+def _compute_tc(nunistr: str) -> Tuple[TokenCase, Pattern]:
+    pattern = _classify(nunistr)
+    # CharCase patterns cannot represent irregular cased characters, so
+    # strings containing them are classified by the `str` predicates instead.
+    if not nunistr.isascii() and any(map(_is_irregular, nunistr)):
+        return _compute_irregular_tc(nunistr, pattern)
+    if CharCase.UPPER not in pattern:
+        if CharCase.LOWER in pattern:
+            return (TokenCase.LOWER, None)
+        return (TokenCase.DC, None)
     # If title and upper have a fight, title wins. Arguably, "A" is usually
     # titlecase, not uppercase.
+    if not _NONTITLE.search(pattern):
+        return (TokenCase.TITLE, None)
+    elif CharCase.LOWER not in pattern:
+        return (TokenCase.UPPER, None)
+    return (TokenCase.MIXED, pattern)
+
+
+def _compute_irregular_tc(
+    nunistr: str, pattern: ObligatoryPattern
+) -> Tuple[TokenCase, Pattern]:
+    if nunistr.islower():
+        return (TokenCase.LOWER, None)
     elif nunistr.istitle():
         return (TokenCase.TITLE, None)
     elif nunistr.isupper():
         return (TokenCase.UPPER, None)
-    pattern = [get_cc(nunichr) for nunichr in nunistr]
-    if all(tc == CharCase.DC for tc in pattern):
+    elif CharCase.UPPER not in pattern and CharCase.LOWER not in pattern:
         return (TokenCase.DC, None)
     return (TokenCase.MIXED, pattern)
 
 
+# Byte translations applying each CharCase to ASCII, indexed by CharCase.
+_ASCII_APPLIERS: Tuple[bytes, bytes, bytes] = (
+    bytes(range(256)),
+    bytes(range(256)).lower(),
+    bytes(range(256)).upper(),
+)
+
+
+@functools.lru_cache(maxsize=0x1000)
+def _apply_mixed_pattern(nunistr: str, pattern: ObligatoryPattern) -> str:
+    assert pattern
+    assert len(nunistr) == len(pattern)
+    # ASCII strings are cased by table lookup, without any per-character
+    # string allocation.
+    if nunistr.isascii():
+        try:
+            return bytes(
+                _ASCII_APPLIERS[cc][byte]
+                for (byte, cc) in zip(nunistr.encode("ascii"), pattern)
+            ).decode("ascii")
+        except IndexError:
+            raise UnknownCharCaseError(max(pattern))
+    chars = list(nunistr)
+    for (i, cc) in enumerate(pattern):
+        if cc == CharCase.LOWER:
+            chars[i] = chars[i].lower()
+        elif cc == CharCase.UPPER:
+            chars[i] = chars[i].upper()
+        elif cc != CharCase.DC:
+            raise UnknownCharCaseError(cc)
+    return "".join(chars)
+
+
+def _apply_mixed(nunistr: str, pattern: Pattern) -> str:
+    # Defaults to lowercase if no pattern is provided.
+    if pattern is None:
+        return nunistr.lower()
+    # The same token usually recurs with the same pattern, so results are
+    # cached; patterns given as other iterables are converted to bytes so
+    # that they can serve as keys.
+    if not isinstance(pattern, bytes):
+        pattern = bytes(pattern)
+    return _apply_mixed_pattern(nunistr, pattern)
+
+
+# Functions applying each TokenCase, indexed by TokenCase value. Each takes
+# the string and the (possibly ignored) pattern.
+_TC_APPLIERS: Tuple[Callable[[str, Pattern], str], ...] = (
+    lambda nunistr, pattern: nunistr,
+    lambda nunistr, pattern: nunistr.lower(),
+    lambda nunistr, pattern: nunistr.upper(),
+    lambda nunistr, pattern: nunistr.title(),
+    _apply_mixed,
+)
+
+
 def apply_tc(nunistr: str, tc: TokenCase, pattern: Pattern = None) -> str:
     """Applies TokenCase to a Unicode string.
 
@@ -143,7 +305,7 @@ def apply_tc(nunistr: str, tc: TokenCase, pattern: Pattern = None) -> str:
     Args:
         nunistr: A Unicode string to be cased.
         tc: A TokenCase indicating the casing to be applied.
-        pattern: An iterable of CharCase characters representing the specifics
+        pattern: An iterable of CharCase values representing the specifics
             of the `MIXED` TokenCase, when the `tc` argument is `MIXED`.
 
     Returns:
@@ -152,19 +314,7 @@ def apply_tc(nunistr: str, tc: TokenCase, pattern: Pattern = None) -> str:
     Raises:
         UnknownTokenCaseError.
     """
-    if tc == TokenCase.DC:
-        return nunistr
-    elif tc == TokenCase.LOWER:
-        return nunistr.lower()
-    elif tc == TokenCase.UPPER:
-        return nunistr.upper()
-    elif tc == TokenCase.TITLE:
-        return nunistr.title()
-    elif tc == TokenCase.MIXED:
-        # Defaults to lowercase if no pattern is provided.
-        if pattern is None:
-            return nunistr.lower()
-        assert pattern
-        assert len(nunistr) == len(pattern)
-        return "".join(apply_cc(ch, cc) for (ch, cc) in zip(nunistr, pattern))
-    raise UnknownTokenCaseError(tc)
+    value = int(tc)
+    if not 0 <= value < len(_TC_APPLIERS):
+        raise UnknownTokenCaseError(tc)
+    return _TC_APPLIERS[value](nunistr, pattern)
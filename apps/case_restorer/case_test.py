@@ -23,7 +23,7 @@ class CaseTests(unittest.TestCase):
     def assertMixedTcEqual(self, token, expected_pattern):
         (tc, pattern) = case.get_tc(token)
         self.assertEqual(tc, case.TokenCase.MIXED)
-        self.assertEqual(pattern, expected_pattern)
+        self.assertEqual(pattern, bytes(expected_pattern))
 
     # Data definitions.
 
@@ -197,6 +197,14 @@ class CaseTests(unittest.TestCase):
         for token in quirky_titlecase:
             self.assertSimpleTcEqual(token, case.TokenCase.TITLE)
 
+    def testIrregularCasedCharacters(self):
+        # Cased characters outside of 'Ll' and 'Lu'.
+        self.assertSimpleTcEqual("ǅ", case.TokenCase.TITLE)
+        self.assertSimpleTcEqual("ǅemal", case.TokenCase.TITLE)
+        self.assertSimpleTcEqual("Ⅻ", case.TokenCase.TITLE)
+        self.assertSimpleTcEqual("ª", case.TokenCase.LOWER)
+        self.assertSimpleTcEqual("Nª", case.TokenCase.TITLE)
+
     def testNumbers(self):
         numbers = ["212", "97000", "１２３", "١٢٣"]
         for token in numbers:
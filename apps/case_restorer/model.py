@@ -1,13 +1,29 @@
 """Case restorer model."""
 
+import array
+import base64
+import functools
 import json
+import operator
+import sys
 
-from typing import Iterator, List, Tuple
+from typing import Iterator, List, Tuple, Union
 
 import nlup  # type: ignore
 import perceptronix
 
 from case_restorer import case
+from feature_encoding import EncodedVectors
+
+try:
+    # orjson is much faster, and reads and writes the same JSON.
+    import orjson  # type: ignore
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
 
 
 # Constant feature strings.
@@ -19,19 +35,79 @@ PENINITIAL = "*peninitial*"
 HYPHEN = "*hyphen*"
 NUMBER = "*number*"
 
+# Context feature prefixes.
+
+W_I = sys.intern("w_i=")
+W_I_MINUS_1 = sys.intern("w_i-1=")
+W_I_MINUS_2 = sys.intern("w_i-2=")
+W_I_PLUS_1 = sys.intern("w_i+1=")
+W_I_PLUS_2 = sys.intern("w_i+2=")
+
 
 Tokens = List[str]
-Tags = List[case.TokenCase]
+# Integral TokenCase values, one byte each.
+Tags = array.array
 Patterns = List[case.Pattern]
 
 Vector = List[str]
 Vectors = List[Vector]
+# Context feature strings for a token; see `_context_features`.
+Context = Tuple[str, str, str, str, str]
+
+
+@functools.lru_cache(maxsize=0x10000)
+def _context_features(token: str) -> Context:
+    """Computes the context feature strings for a token.
+
+    Repeated tokens share the resulting strings, so each is formatted once
+    rather than once per occurrence.
+
+    Returns:
+        A tuple of the features for the token when it occurs at offsets 0,
+        -1, -2, +1, and +2 relative to the position being featurized.
+    """
+    return (
+        W_I + token,
+        W_I_MINUS_1 + token,
+        W_I_MINUS_2 + token,
+        W_I_PLUS_1 + token,
+        W_I_PLUS_2 + token,
+    )
+
+
+def _add_shape_features(token: str, vector: Vector) -> None:
+    if "-" in token:
+        vector.append(HYPHEN)
+    if any(map(str.isdigit, token)):
+        vector.append(NUMBER)
+
+
+def _boundary_vector(
+    tokens: Tokens, contexts: List[Context], i: int
+) -> Vector:
+    """Computes the feature vector for a position near a sentence boundary."""
+    vector = [contexts[i][0]]
+    # Context features.
+    if i == 0:
+        vector.append(INITIAL)
+    else:
+        vector.append(contexts[i - 1][1])
+        if i == 1:
+            vector.append(PENINITIAL)
+        else:
+            vector.append(contexts[i - 2][2])
+    if i < len(tokens) - 1:
+        vector.append(contexts[i + 1][3])
+        if i < len(tokens) - 2:
+            vector.append(contexts[i + 2][4])
+    _add_shape_features(tokens[i], vector)
+    return vector
 
 
 class CaseRestorer(object):
     """Case restorer model."""
 
-    slots = ["_classifier", "_mpt"]
+    __slots__ = ["_classifier", "_mpt"]
 
     def __init__(
         self,
@@ -59,17 +135,30 @@ class CaseRestorer(object):
         )
         new = cls.__new__(cls)
         new._classifier = classifier
-        new._mpt = json.loads(metadata)
+        # Patterns are stored as base64-encoded strings; older models store
+        # them as lists of CharCase values instead.
+        new._mpt = {
+            token: bytes(pattern)
+            if isinstance(pattern, list)
+            else base64.b64decode(pattern)
+            for (token, pattern) in _json_loads(metadata).items()
+        }
         return new
 
     def write(self, filename) -> None:
-        self._classifier.write(filename, json.dumps(self._mpt))
+        mpt = {
+            token: base64.b64encode(pattern).decode("ascii")
+            for (token, pattern) in self._mpt.items()
+        }
+        self._classifier.write(filename, _json_dumps(mpt))
 
     # Data readers.
 
     @staticmethod
     def sentences_from_file(filename: str) -> Iterator[Tokens]:
-        with open(filename, "r") as source:
+        # Newlines are left untranslated; `split` discards any carriage
+        # returns along with the other whitespace.
+        with open(filename, "r", encoding="utf8", newline="\n") as source:
             for line in source:
                 yield line.split()
 
@@ -78,62 +167,71 @@ class CaseRestorer(object):
         filename: str,
     ) -> Iterator[Tuple[Tokens, Tags, Patterns]]:
         for tokens in CaseRestorer.sentences_from_file(filename):
-            (tags, patterns) = zip(*(case.get_tc(token) for token in tokens))
+            tags = array.array("B", bytes(len(tokens)))
+            patterns: Patterns = [None] * len(tokens)
+            for (i, token) in enumerate(tokens):
+                (tags[i], patterns[i]) = case.get_tc(token)
             # Casefolds after we get the labels.
-            tokens = [token.casefold() for token in tokens]
-            yield (tokens, list(tags), list(patterns))
+            tokens = [sys.intern(token.casefold()) for token in tokens]
+            yield (tokens, tags, patterns)
 
     # Feature extraction.
 
     @staticmethod
     @nlup.listify
     def extract_emission_features(tokens: Tokens) -> Iterator[Vector]:
-        """Generates emission feature vectors for a sentence."""
-        # Tokens are assumed to have already been case-folded.
-        for (i, token) in enumerate(tokens):
-            vector = [f"w_i={token}"]
-            # Context features.
-            if i == 0:
-                vector.append(INITIAL)
-            else:
-                vector.append(f"w_i-1={tokens[i - 1]}")
-                if i == 1:
-                    vector.append(PENINITIAL)
-                else:
-                    vector.append(f"w_i-2={tokens[i - 2]}")
-            if i < len(tokens) - 1:
-                vector.append(f"w_i+1={tokens[i + 1]}")
-                if i < len(tokens) - 2:
-                    vector.append(f"w_i+2={tokens[i + 2]}")
-            # Shape features.
-            if "-" in token:
-                vector.append(HYPHEN)
-            if any(ch.isdigit() for ch in token):
-                vector.append(NUMBER)
+        """Generates emission feature vectors for a sentence.
+
+        Tokens must already be case-folded; folding happens exactly once,
+        in `tagged_sentences_from_file`, after the labels are computed.
+        """
+        contexts = [_context_features(token) for token in tokens]
+        # Only the first two and last two positions need boundary checks; the
+        # interior positions, usually the vast majority, are featurized
+        # without any.
+        n = len(tokens)
+        head = min(2, n)
+        for i in range(head):
+            yield _boundary_vector(tokens, contexts, i)
+        for i in range(2, n - 2):
+            vector = [
+                contexts[i][0],
+                contexts[i - 1][1],
+                contexts[i - 2][2],
+                contexts[i + 1][3],
+                contexts[i + 2][4],
+            ]
+            _add_shape_features(tokens[i], vector)
             yield vector
+        for i in range(max(head, n - 2), n):
+            yield _boundary_vector(tokens, contexts, i)
 
     # Training and prediction.
 
-    # `train` is delegated to the underlying classifier.
+    def train(
+        self, vectors: Union[Vectors, EncodedVectors], tags: Tags
+    ) -> int:
+        """Trains on a sentence, returning the number of correct tags."""
+        return self._classifier.train(vectors, tags)
 
-    def predict(self, vectors: Vectors) -> Iterator[case.TokenCase]:
-        for label in self._classifier.predict(vectors):
-            yield case.TokenCase(label)
+    def average(self) -> None:
+        self._classifier.average()
 
-    def evaluate(self, vectors: Vectors, tags: Tags) -> int:
-        return sum(
-            tag == predicted_tag
-            for (tag, predicted_tag) in zip(tags, self.predict(vectors))
-        )
+    def predict(
+        self, vectors: Union[Vectors, EncodedVectors]
+    ) -> Iterator[case.TokenCase]:
+        return map(case.TokenCase, self._classifier.predict(vectors))
+
+    def evaluate(
+        self, vectors: Union[Vectors, EncodedVectors], tags: Tags
+    ) -> int:
+        # Compares against the raw integral predictions; TokenCase is an
+        # IntEnum, so there is no need to wrap them.
+        return sum(map(operator.eq, tags, self._classifier.predict(vectors)))
 
     def apply(self, tokens: Tokens) -> Iterator[str]:
+        """Cases a sentence of case-folded tokens."""
         vectors = CaseRestorer.extract_emission_features(tokens)
         for (token, tag) in zip(tokens, self.predict(vectors)):
             pattern = self._mpt.get(token)
             yield case.apply_tc(token, tag, pattern)
-
-    # Delegates all attributes not otherwise defined to the underlying
-    # classifier.
-
-    def __getattr__(self, name):
-        return getattr(self._classifier, name)
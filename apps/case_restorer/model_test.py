@@ -0,0 +1,45 @@
+"""Unit tests for case restorer feature extraction."""
+
+
+from case_restorer.model import HYPHEN, NUMBER, CaseRestorer
+
+import unittest
+
+
+class CaseRestorerTests(unittest.TestCase):
+
+    """Tests of case restorer feature extraction."""
+
+    def assertShapeFeatures(self, token, expected_features):
+        # Pads the token so that it is featurized as an interior position.
+        tokens = ["a", "b", token, "c", "d"]
+        vector = list(CaseRestorer.extract_emission_features(tokens))[2]
+        self.assertEqual(
+            [feature for feature in vector if feature in (HYPHEN, NUMBER)],
+            expected_features,
+        )
+
+    def testNumber(self):
+        for token in ["1990s", "１２３", "١٢٣"]:
+            self.assertShapeFeatures(token, [NUMBER])
+
+    def testDigitLikeNumber(self):
+        # These are digits to `str.isdigit` but not decimal digits.
+        for token in ["km²", "x³", "①", "H₂O", "⁴"]:
+            self.assertShapeFeatures(token, [NUMBER])
+
+    def testHyphen(self):
+        self.assertShapeFeatures("well-known", [HYPHEN])
+        self.assertShapeFeatures("covid-19", [HYPHEN, NUMBER])
+
+    def testNoShape(self):
+        for token in ["dog", "Ⅻ", "½"]:
+            self.assertShapeFeatures(token, [])
+
+    def testBoundaryNumber(self):
+        for vector in CaseRestorer.extract_emission_features(["km²", "①"]):
+            self.assertIn(NUMBER, vector)
+
+
+if __name__ == "__main__":
+    unittest.main()
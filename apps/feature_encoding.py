@@ -0,0 +1,35 @@
+"""Feature encoding shared by the sequence tagging apps."""
+
+
+from typing import Dict, Iterable, List, Tuple
+
+
+# Feature vectors whose features have been encoded to UTF-8 bytestrings; the
+# sequential classifiers accept these in place of strings.
+EncodedVectors = List[Tuple[bytes, ...]]
+
+
+def encode_vectors(
+    vectors: Iterable[Iterable[str]], memo: Dict[str, bytes]
+) -> EncodedVectors:
+    """Encodes the feature vectors for a sentence.
+
+    Args:
+        vectors: Feature vectors, one per token.
+        memo: A mapping from features to their encodings, shared across
+            calls; each distinct feature is encoded only once, and all of its
+            occurrences share a single bytestring.
+
+    Returns:
+        The encoded feature vectors.
+    """
+    fvectors = []
+    for vector in vectors:
+        fvector = []
+        for feature in vector:
+            fbytes = memo.get(feature)
+            if fbytes is None:
+                fbytes = memo[feature] = feature.encode("utf8")
+            fvector.append(fbytes)
+        fvectors.append(tuple(fvector))
+    return fvectors
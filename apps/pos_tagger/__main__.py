@@ -2,23 +2,40 @@
 
 import argparse
 import logging
+import multiprocessing
 import random
 
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Tuple
 
 import nlup  # type: ignore
 
-from .model import POSTagger
+from feature_encoding import EncodedVectors, encode_vectors
 
-Data = List[Tuple[List[str], List[str]]]
+from .model import POSTagger, Tags, Vectors
 
+Data = List[Tuple[EncodedVectors, Tags]]
 
-def _read_data(filename: str) -> Data:
-    # TODO(kbg): Why is this raising a type error?
-    return [
-        (POSTagger.extract_emission_features(tokens), tags)  # type: ignore
-        for (tokens, tags) in POSTagger.tagged_sentences_from_file(filename)
-    ]
+
+def _read_data(filename: str, jobs: int = 1) -> Data:
+    source: Iterable[Tuple[Vectors, Tags]]
+    if jobs > 1:
+        # Only the token lists are sent to the workers; the tags stay behind
+        # and are paired back up with the returned vectors.
+        sentences = list(POSTagger.tagged_sentences_from_file(filename))
+        with multiprocessing.Pool(jobs) as pool:
+            vector_lists = pool.map(
+                POSTagger.extract_emission_features,
+                [tokens for (tokens, _) in sentences],
+                chunksize=0x100,
+            )
+        source = zip(vector_lists, (tags for (_, tags) in sentences))
+    else:
+        source = POSTagger.tagged_vectors_from_file(filename)
+    # Tagged corpora repeat the same word and affix features many times
+    # over; storing each sentence pre-encoded spares the tagger a UTF-8
+    # conversion per feature on every epoch.
+    memo: Dict[str, bytes] = {}
+    return [(encode_vectors(vectors, memo), tags) for (vectors, tags) in source]
 
 
 def _data_size(data: Data) -> int:
@@ -71,6 +88,12 @@ argparser.add_argument(
     help="margin constant (default: %(default)s)",
 )
 argparser.add_argument("--seed", type=int, default=0, help="random seed")
+argparser.add_argument(
+    "--jobs",
+    type=int,
+    default=1,
+    help="worker processes for featurizing sentences (default: %(default)s)",
+)
 args = argparser.parse_args()
 
 # Verbosity block.
@@ -83,18 +106,21 @@ else:
 if args.train:
     model = POSTagger(args.nfeats, args.nlabels, args.order, args.c)
     logging.info("Training model from %s", args.train)
-    train_data = _read_data(args.train)
+    train_data = _read_data(args.train, args.jobs)
     train_size = _data_size(train_data)
     if args.dev:
-        dev_data = _read_data(args.dev)
+        dev_data = _read_data(args.dev, args.jobs)
         dev_size = _data_size(dev_data)
     random.seed(args.seed)
+    # Shuffles the indices rather than the data itself.
+    order = list(range(len(train_data)))
     for epoch in range(1, 1 + args.epochs):
-        random.shuffle(train_data)
+        random.shuffle(order)
         logging.info("Epoch %d...", epoch)
         train_correct = 0
         with nlup.Timer():
-            for (vectors, tags) in train_data:
+            for index in order:
+                (vectors, tags) = train_data[index]
                 train_correct += model.train(vectors, tags)
         logging.info(
             "Resubstitution accuracy: %.4f", train_correct / train_size
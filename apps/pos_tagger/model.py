@@ -1,11 +1,17 @@
 """POS tagger model."""
 
+import functools
+import itertools
 import logging
+import operator
+import sys
 
-from typing import Iterator, List, Tuple
+from typing import Iterator, List, Tuple, Union
 
 import perceptronix
 
+from feature_encoding import EncodedVectors
+
 
 # Constant feature string.
 
@@ -18,6 +24,18 @@ HYPHEN = "*hyphen*"
 NUMBER = "*number*"
 UPPERCASE = "*uppercase*"
 
+# Affix lengths with their feature prefixes.
+
+AFFIXES = tuple((i, f"pre({i})=", f"suf({i})=") for i in range(1, 1 + 4))
+
+# Context feature prefixes.
+
+W_I = sys.intern("w_i=")
+W_I_MINUS_1 = sys.intern("w_i-1=")
+W_I_MINUS_2 = sys.intern("w_i-2=")
+W_I_PLUS_1 = sys.intern("w_i+1=")
+W_I_PLUS_2 = sys.intern("w_i+2=")
+
 # Types.
 
 Tokens = List[str]
@@ -26,10 +44,27 @@ Vector = List[str]
 Vectors = List[Vector]
 
 
+@functools.lru_cache(maxsize=0x20000)
+def _context_features(token: str) -> Tuple[str, str, str, str, str]:
+    """Computes the context feature strings for a token.
+
+    Returns:
+        A tuple of the features for the token when it occurs at offsets 0,
+        -1, -2, +1, and +2 relative to the position being featurized.
+    """
+    return (
+        W_I + token,
+        W_I_MINUS_1 + token,
+        W_I_MINUS_2 + token,
+        W_I_PLUS_1 + token,
+        W_I_PLUS_2 + token,
+    )
+
+
 class POSTagger(object):
     """Part-of-speech tagger model."""
 
-    slots = ["_classifier"]
+    __slots__ = ["_classifier"]
 
     def __init__(
         self,
@@ -55,129 +90,166 @@ class POSTagger(object):
         new._classifier = classifier
         return new
 
-    # `write` is delegated to the underlying classifier.
+    def write(self, filename: str) -> None:
+        self._classifier.write(filename, "")
 
     # Data readers.
 
     @staticmethod
     def sentences_from_file(filename: str) -> Iterator[Tokens]:
-        tokens: Tokens = []
-        with open(filename, "r") as source:
-            for line in source:
-                line = line.strip()
-                if (not line) and tokens:
-                    yield tokens
-                    tokens = []
-                else:
-                    tokens.append(line)
-        if tokens:
-            yield tokens
+        # Newlines are left untranslated; `strip` discards any carriage
+        # returns. Sentences are runs of non-blank lines.
+        with open(filename, "r", encoding="utf8", newline="\n") as source:
+            for (blank, lines) in itertools.groupby(source, str.isspace):
+                if not blank:
+                    yield [line.strip() for line in lines]
 
     @staticmethod
     def tagged_sentences_from_file(
         filename: str,
     ) -> Iterator[Tuple[Tokens, Tags]]:
-        tokens: Tokens = []
-        tags: Tags = []
-        with open(filename, "r") as source:
-            for line in source:
-                line = line.strip()
-                if (not line) and tokens and tags:
-                    yield (tokens.copy(), tags.copy())
-                    tokens.clear()
-                    tags.clear()
-                else:
-                    (token, tag) = line.split("\t", 1)
+        # Lines are read as in `sentences_from_file`.
+        with open(filename, "r", encoding="utf8", newline="\n") as source:
+            for (blank, lines) in itertools.groupby(
+                enumerate(source, 1), lambda item: item[1].isspace()
+            ):
+                if blank:
+                    continue
+                tokens: Tokens = []
+                tags: Tags = []
+                for (lineno, line) in lines:
+                    (token, tab, tag) = line.strip().partition("\t")
+                    if not tab:
+                        raise ValueError(
+                            f"No tab separator on line {lineno} of {filename}"
+                        )
                     tokens.append(token)
                     tags.append(tag)
-        if tokens:
-            yield (tokens, tags)
+                yield (tokens, tags)
+
+    @staticmethod
+    def tagged_vectors_from_file(
+        filename: str,
+    ) -> Iterator[Tuple[Vectors, Tags]]:
+        """Streams featurized sentences, one sentence at a time."""
+        for (tokens, tags) in POSTagger.tagged_sentences_from_file(filename):
+            yield (POSTagger.extract_emission_features(tokens), tags)
 
     # Feature extraction.
 
     @staticmethod
-    def _shape_features(token: str) -> Iterator[str]:
+    @functools.lru_cache(maxsize=0x20000)
+    def _shape_features(token: str) -> Tuple[str, ...]:
+        features = []
         if len(token) > 4:  # TODO(kbg): Tune this.
-            for i in range(1, 1 + 4):
-                yield f"pre({i})={token[:i]}"
-                yield f"suf({i})={token[-i:]}"
-        if "-" in token:
-            yield HYPHEN
-        if any(ch.isdigit() for ch in token):
-            yield NUMBER
-        if any(ch.isupper() for ch in token):
-            yield UPPERCASE
+            for (i, prefix, suffix) in AFFIXES:
+                features.append(prefix + token[:i])
+                features.append(suffix + token[-i:])
+        # Classifies the characters in a single pass.
+        hyphen = number = uppercase = False
+        for ch in token:
+            if ch == "-":
+                hyphen = True
+            elif ch.isdigit():
+                number = True
+            elif ch.isupper():
+                uppercase = True
+        if hyphen:
+            features.append(HYPHEN)
+        if number:
+            features.append(NUMBER)
+        if uppercase:
+            features.append(UPPERCASE)
+        return tuple(features)
 
     @staticmethod
     def extract_emission_features(tokens: Tokens) -> List[Vector]:
-        """Generates emission feature vectors for a sentence."""
+        """Generates emission feature vectors for a sentence.
+
+        Only the first two and last two positions need edge features; the
+        interior positions, usually the vast majority, are featurized in a
+        single uniform loop.
+        """
         # TODO(kbg): Add casing features.
-        if not tokens:
+        n = len(tokens)
+        if not n:
             return []
-        vectors = [[f"w_i={token}"] for token in tokens]
+        contexts = [_context_features(token) for token in tokens]
+        # Slides a five-token window over the contexts; each vector is built
+        # at its final size in a single display.
+        interior = [
+            [
+                current[0],
+                m2[2],
+                m1[1],
+                *POSTagger._shape_features(token),
+                p1[3],
+                p2[4],
+            ]
+            for (token, m2, m1, current, p1, p2) in zip(
+                tokens[2:],
+                contexts,
+                contexts[1:],
+                contexts[2:],
+                contexts[3:],
+                contexts[4:],
+            )
+        ]
+        vectors = [
+            *([context[0]] for context in contexts[: min(2, n)]),
+            *interior,
+            *([context[0]] for context in contexts[max(2, n - 2) :]),
+        ]
         # Left edge features.
-        initial = tokens[0]
         initial_vector = vectors[0]
         initial_vector.append(INITIAL)
-        initial_vector.extend(POSTagger._shape_features(initial))
-        if len(tokens) > 1:
-            peninitial = tokens[1]
-            initial_vector.append(f"w_i+1={peninitial}")
+        initial_vector.extend(POSTagger._shape_features(tokens[0]))
+        if n > 1:
+            initial_vector.append(contexts[1][3])
             peninitial_vector = vectors[1]
             peninitial_vector.append(PENINITIAL)
-            peninitial_vector.append(f"w_i-1={initial}")
-            peninitial_vector.extend(POSTagger._shape_features(peninitial))
-            if len(tokens) > 2:
-                antepeninitial = tokens[2]
-                initial_vector.append(f"w_i+2={antepeninitial}")
-                peninitial_vector.append(f"w_i+1={antepeninitial}")
-        # Internal features.
-        for (i, token) in enumerate(tokens[2:-2], 2):
-            current_vector = vectors[i]
-            current_vector.append(f"w_i-2={tokens[i - 2]}")
-            current_vector.append(f"w_i-1={tokens[i - 1]}")
-            current_vector.extend(POSTagger._shape_features(token))
-            current_vector.append(f"w_i+1={tokens[i + 1]}")
-            current_vector.append(f"w_i+2={tokens[i + 2]}")
+            peninitial_vector.append(contexts[0][1])
+            peninitial_vector.extend(POSTagger._shape_features(tokens[1]))
+            if n > 2:
+                initial_vector.append(contexts[2][4])
+                peninitial_vector.append(contexts[2][3])
         # Right edge features.
-        ultimate = tokens[-1]
         ultimate_vector = vectors[-1]
         ultimate_vector.append(ULTIMATE)
-        ultimate_vector.extend(POSTagger._shape_features(ultimate))
-        if len(tokens) > 1:
-            penultimate = tokens[-2]
-            ultimate_vector.append(f"w_i-1={penultimate}")
+        ultimate_vector.extend(POSTagger._shape_features(tokens[-1]))
+        if n > 1:
+            ultimate_vector.append(contexts[-2][1])
             penultimate_vector = vectors[-2]
             penultimate_vector.append(PENULTIMATE)
-            penultimate_vector.append(f"w_i+1={ultimate}")
-            penultimate_vector.extend(POSTagger._shape_features(penultimate))
-            if len(tokens) > 2:
-                antepenultimate = tokens[-3]
-                ultimate_vector.append(f"w_i-2={antepenultimate}")
-                penultimate_vector.append(f"w_i-1={antepenultimate}")
-        # And we're done!
+            penultimate_vector.append(contexts[-1][3])
+            penultimate_vector.extend(POSTagger._shape_features(tokens[-2]))
+            if n > 2:
+                ultimate_vector.append(contexts[-3][2])
+                penultimate_vector.append(contexts[-3][1])
         return vectors
 
     # Training and prediction.
 
-    # `train` is delegated to the underlying classifier.
+    def train(
+        self, vectors: Union[Vectors, EncodedVectors], tags: Tags
+    ) -> int:
+        """Trains on a sentence, returning the number of correct tags."""
+        # The whole sentence crosses into the extension in a single call.
+        return self._classifier.train(vectors, tags)
 
-    def predict(self, vectors: Vectors) -> Iterator[str]:
-        for tag in self._classifier.predict(vectors):
-            yield tag
+    def average(self) -> None:
+        self._classifier.average()
 
-    def evaluate(self, vectors: Vectors, tags: Tags) -> int:
-        return sum(
-            tag == predicted_tag
-            for (tag, predicted_tag) in zip(tags, self.predict(vectors))
-        )
+    def predict(self, vectors: Union[Vectors, EncodedVectors]) -> List[str]:
+        # The whole sentence is decoded, and its labels converted, in a single
+        # call into the extension.
+        return self._classifier.predict(vectors)
+
+    def evaluate(
+        self, vectors: Union[Vectors, EncodedVectors], tags: Tags
+    ) -> int:
+        return sum(map(operator.eq, tags, self.predict(vectors)))
 
     def apply(self, tokens: Tokens) -> Iterator[Tuple[str, str]]:
         vectors = POSTagger.extract_emission_features(tokens)
         yield from zip(tokens, self.predict(vectors))
-
-    # Delegates all attributes not otherwise defined to the underlying
-    # classifier.
-
-    def __getattr__(self, name):
-        return getattr(self._classifier, name)
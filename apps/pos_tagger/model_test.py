@@ -0,0 +1,99 @@
+"""Unit tests for POS tagger feature extraction."""
+
+
+from pos_tagger.model import POSTagger
+
+import itertools
+import unittest
+
+
+def _reference_shape_features(token):
+    if len(token) > 4:
+        for i in range(1, 1 + 4):
+            yield f"pre({i})={token[:i]}"
+            yield f"suf({i})={token[-i:]}"
+    if "-" in token:
+        yield "*hyphen*"
+    if any(ch.isdigit() for ch in token):
+        yield "*number*"
+    if any(ch.isupper() for ch in token):
+        yield "*uppercase*"
+
+
+def _reference_emission_features(tokens):
+    """The original, unoptimized feature extractor."""
+    if not tokens:
+        return []
+    vectors = [[f"w_i={token}"] for token in tokens]
+    # Left edge features.
+    initial = tokens[0]
+    initial_vector = vectors[0]
+    initial_vector.append("*initial*")
+    initial_vector.extend(_reference_shape_features(initial))
+    if len(tokens) > 1:
+        peninitial = tokens[1]
+        initial_vector.append(f"w_i+1={peninitial}")
+        peninitial_vector = vectors[1]
+        peninitial_vector.append("*peninitial*")
+        peninitial_vector.append(f"w_i-1={initial}")
+        peninitial_vector.extend(_reference_shape_features(peninitial))
+        if len(tokens) > 2:
+            antepeninitial = tokens[2]
+            initial_vector.append(f"w_i+2={antepeninitial}")
+            peninitial_vector.append(f"w_i+1={antepeninitial}")
+    # Internal features.
+    for (i, token) in enumerate(tokens[2:-2], 2):
+        current_vector = vectors[i]
+        current_vector.append(f"w_i-2={tokens[i - 2]}")
+        current_vector.append(f"w_i-1={tokens[i - 1]}")
+        current_vector.extend(_reference_shape_features(token))
+        current_vector.append(f"w_i+1={tokens[i + 1]}")
+        current_vector.append(f"w_i+2={tokens[i + 2]}")
+    # Right edge features.
+    ultimate = tokens[-1]
+    ultimate_vector = vectors[-1]
+    ultimate_vector.append("*ultimate*")
+    ultimate_vector.extend(_reference_shape_features(ultimate))
+    if len(tokens) > 1:
+        penultimate = tokens[-2]
+        ultimate_vector.append(f"w_i-1={penultimate}")
+        penultimate_vector = vectors[-2]
+        penultimate_vector.append("*penultimate*")
+        penultimate_vector.append(f"w_i+1={ultimate}")
+        penultimate_vector.extend(_reference_shape_features(penultimate))
+        if len(tokens) > 2:
+            antepenultimate = tokens[-3]
+            ultimate_vector.append(f"w_i-2={antepenultimate}")
+            penultimate_vector.append(f"w_i-1={antepenultimate}")
+    return vectors
+
+
+class POSTaggerTests(unittest.TestCase):
+
+    """Tests of POS tagger feature extraction."""
+
+    vocabulary = ["the", "Dog", "well-known", "1990s", "barked", "ÉTÉ", "."]
+
+    def assertFeaturesEqual(self, tokens):
+        self.assertEqual(
+            POSTagger.extract_emission_features(tokens),
+            _reference_emission_features(tokens),
+        )
+
+    def testShortSentences(self):
+        # Covers every sentence of up to three tokens, where the edges
+        # overlap one another.
+        for n in range(4):
+            for tokens in itertools.product(self.vocabulary, repeat=n):
+                self.assertFeaturesEqual(list(tokens))
+
+    def testLongSentences(self):
+        for n in range(4, 1 + 2 * len(self.vocabulary)):
+            cycle = itertools.cycle(self.vocabulary)
+            tokens = list(itertools.islice(cycle, n))
+            self.assertFeaturesEqual(tokens)
+            self.assertFeaturesEqual(tokens[::-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,7 @@ import argparse
 import logging
 import random
 
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 import nlup  # type: ignore
 import regex  # type: ignore
@@ -14,15 +14,25 @@ from .model import SentenceTokenizer
 
 CANDIDATE_REGEX = regex.compile(r"(?:\s+)(\S+[\.\!\?]['\"]?)(\s+)(\S+)(?:\s+)")
 
+# Number of examples passed to the classifier per training call.
+BATCH_SIZE = 0x400
+
 
 Data = List[Tuple[List[str], bool]]
 
 
 def _read_data(filename: str, model: SentenceTokenizer) -> Data:
-    return [
-        (model.extract_features(candidate), candidate.boundary)
-        for candidate in model.candidates_from_file(args.train)
-    ]
+    data = []
+    # Features depend only on the contexts, which often repeat; candidates
+    # sharing contexts share a single feature vector.
+    vectors: Dict[Tuple[str, str], List[str]] = {}
+    for candidate in model.candidates_from_file(filename):
+        key = (candidate.left, candidate.right)
+        vector = vectors.get(key)
+        if vector is None:
+            vector = vectors[key] = model.extract_features(candidate)
+        data.append((vector, candidate.boundary))
+    return data
 
 
 argparser = argparse.ArgumentParser(
@@ -87,13 +97,22 @@ if args.train:
     train_data = _read_data(args.train, model)
     dev_data = _read_data(args.dev, model) if args.dev else None
     random.seed(args.seed)
+    # Shuffles the indices rather than the data itself.
+    order = list(range(len(train_data)))
     for epoch in range(1, 1 + args.epochs):
-        random.shuffle(train_data)
+        random.shuffle(order)
         logging.info("Epoch %d...", epoch)
         train_correct = 0
         with nlup.Timer():
-            for (vector, boundary) in train_data:
-                train_correct += model.train(vector, boundary)
+            for start in range(0, len(order), BATCH_SIZE):
+                batch = [
+                    train_data[index]
+                    for index in order[start : start + BATCH_SIZE]
+                ]
+                train_correct += model.train_batch(
+                    [vector for (vector, _) in batch],
+                    [boundary for (_, boundary) in batch],
+                )
         logging.info(
             "Resubstitution accuracy: %.4f", train_correct / len(train_data)
         )
@@ -1,18 +1,18 @@
 """Sentence tokenizer model."""
 
 import collections
+import functools
 import logging
 
-from typing import Iterator, List
+from typing import Dict, Iterator, List, Tuple
 
-import nlup  # type: ignore
 import regex  # type: ignore
 import perceptronix
 
 
-# Constant feature strings.
+# Prefixes of boundaries containing a newline.
 
-NEWLINE = regex.compile(r"\n|\r|\r\n")
+NEWLINES = ("\n", "\r")
 
 
 Candidate = collections.namedtuple(
@@ -20,10 +20,16 @@ Candidate = collections.namedtuple(
 )
 
 
+@functools.lru_cache(maxsize=None)
+def _compile(candidate_regex: str):
+    """Compiles a candidate regex, reusing any earlier compilation."""
+    return regex.compile(candidate_regex)
+
+
 class SentenceTokenizer(object):
     """Sentence tokenizer model."""
 
-    slots = ["_candidate_regex", "_max_context", "_classifier"]
+    __slots__ = ["_candidate_regex", "_max_context", "_classifier"]
 
     def __init__(
         self,
@@ -32,7 +38,7 @@ class SentenceTokenizer(object):
         nfeats: int = 0x1000,
         c: int = 0,
     ):
-        self._candidate_regex = regex.compile(candidate_regex)
+        self._candidate_regex = _compile(candidate_regex)
         self._max_context = max_context
         self._classifier = perceptronix.SparseBinomialModel(nfeats, c)
 
@@ -48,11 +54,12 @@ class SentenceTokenizer(object):
             logging.warning("Ignoring metadata string: %s", metadata)
         new = cls.__new__(cls)
         new._classifier = classifier
-        new._candidate_regex = regex.compile(candidate_regex)
+        new._candidate_regex = _compile(candidate_regex)
         new._max_context = max_context
         return new
 
-    # `write` is delegated to the underlying classifier.
+    def write(self, filename: str) -> None:
+        self._classifier.write(filename, "")
 
     # Data readers.
 
@@ -68,7 +75,7 @@ class SentenceTokenizer(object):
                 right_index,
                 left[-left_bound:],
                 right[:right_bound],
-                bool(NEWLINE.match(boundary)),
+                boundary.startswith(NEWLINES),
             )
 
     def candidates_from_file(self, filename: str) -> Iterator[Candidate]:
@@ -78,29 +85,36 @@ class SentenceTokenizer(object):
     # Feature extraction
 
     @staticmethod
-    @nlup.listify
-    def extract_features(candidate: Candidate) -> Iterator[str]:
-        """Generates feature vector for a candidate."""
+    def extract_features(candidate: Candidate) -> List[str]:
+        """Computes feature vector for a candidate."""
+        left = candidate.left
+        right = candidate.right
         # All suffixes of the left context.
-        lpieces = tuple(
-            f"L={candidate.left[-i:]}"
-            for i in range(1, 1 + len(candidate.left))
-        )
-        yield from lpieces
+        lpieces = ["L=" + left[-i:] for i in range(1, 1 + len(left))]
         # All prefixes of the right context.
-        rpieces = tuple(
-            f"R={candidate.right[:i]}"
-            for i in range(1, 1 + len(candidate.right))
-        )
-        yield from rpieces
+        rpieces = ["R=" + right[:i] for i in range(1, 1 + len(right))]
         # Composition of the two.
-        yield from (
-            f"{lpiece}^{rpiece}" for (lpiece, rpiece) in zip(lpieces, rpieces)
+        features = lpieces + rpieces
+        features.extend(
+            lpiece + "^" + rpiece for (lpiece, rpiece) in zip(lpieces, rpieces)
         )
+        return features
 
     # Training and prediction.
 
-    # `train` is delegated to the underlying classifier.
+    def train(self, vector: List[str], tag: bool) -> bool:
+        """Trains on a candidate, returning whether it was correct."""
+        return self._classifier.train(vector, tag)
+
+    def train_batch(self, vectors: List[List[str]], tags: List[bool]) -> int:
+        """Trains on a batch of candidates, returning the number correct."""
+        return self._classifier.train_batch(vectors, tags)
+
+    def average(self) -> None:
+        self._classifier.average()
+
+    def predict(self, vector: List[str]) -> bool:
+        return self._classifier.predict(vector)
 
     def evaluate(self, vector: List[str], tag: bool) -> bool:
         return tag == self.predict(vector)
@@ -108,18 +122,18 @@ class SentenceTokenizer(object):
     def apply(self, text: str) -> Iterator[str]:
         """Tokenize a text."""
         start = 0
+        # The prediction depends only on the contexts, which often repeat.
+        predictions: Dict[Tuple[str, str], bool] = {}
         for candidate in self.candidates(text):
             # Passes through any newlines already present.
             if candidate.boundary:
                 continue
-            vector = SentenceTokenizer.extract_features(candidate)
-            if self.predict(vector):
+            key = (candidate.left, candidate.right)
+            prediction = predictions.get(key)
+            if prediction is None:
+                vector = SentenceTokenizer.extract_features(candidate)
+                prediction = predictions[key] = self.predict(vector)
+            if prediction:
                 yield text[start : candidate.left_index + 1]
                 start = candidate.right_index + 1
         yield text[start:].rstrip()
-
-    # Delegates all attributes not otherwise defined to the underlying
-    # classifier.
-
-    def __getattr__(self, name):
-        return getattr(self._classifier, name)
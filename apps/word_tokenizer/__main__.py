@@ -22,11 +22,10 @@
 import argparse
 import logging
 import random
-import re
 
 import nlup
 
-from .word_tokenizer import WordTokenizer
+from .word_tokenizer import NEWLINES, WordTokenizer
 
 # Defaults
 BOUNDARY_REGEX = r"(\s+)"
@@ -103,17 +102,20 @@ if args.train:
     data = [
         (
             wtokenizer.extract_features(candidate),
-            bool(NEWLINE.match(candidate.boundary)),
+            candidate.boundary.startswith(NEWLINES),
         )
         for candidate in wtokenizer.candidates(text)
     ]
     random.seed(SEED)
+    # Shuffles the indices rather than the data itself.
+    order = list(range(len(data)))
     for epoch in range(1, 1 + args.epochs):
-        random.shuffle(data)
+        random.shuffle(order)
         logging.info("Epoch %d...", epoch)
         correct = 0
         with nlup.Timer():
-            for (features, label) in data:
+            for index in order:
+                (features, label) = data[index]
                 correct += wtokenizer.train(features, label)
         logging.info("Resubstitution accuracy: %.4f", correct / len(data))
     logging.info("Averaging model")
@@ -127,8 +129,10 @@ elif args.read:
 # Output block.
 if args.tokenize:
     logging.info("Tokenizing text from %s", args.tokenize)
-    with open(args.tokenize, "r") as source:
-        text = source.read()
+    # Reuses the training text, if that is what is to be tokenized.
+    if args.tokenize != args.train:
+        with open(args.tokenize, "r") as source:
+            text = source.read()
     for line in wtokenizer.tokenize(text):
         print(line)
 elif args.write:
@@ -20,16 +20,15 @@
 # SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 import collections
+import re
 import unicodedata
 
-import nlup
-import regex
 import perceptronix
 
 # Default encoding and normalization scheme.
 ENCODING = "utf-8"
 NORMALIZATION = "NFKC"
-NEWLINE = re.compile(b"[\n\r]")  # That'll do for now.
+NEWLINES = (b"\n", b"\r")  # Prefixes of boundaries containing a newline.
 
 # How far we look to the left of the boundary when trying to match the
 # left context regex.
@@ -64,9 +63,26 @@ class SentenceTokenizer(object):
             *args, **kwargs
         )
 
+    def read(self, filename):
+        (self._classifier, _) = perceptronix.SparseBinomialClassifier.read(
+            filename
+        )
+
+    def write(self, filename):
+        self._classifier.write(filename, "")
+
     def candidates(self, text):
         """Generates candidate sentence boundary string tuples."""
-        for match in self._candidate_regex.finditer(text, overlapped=True):
+        return self._candidates(SentenceTokenizer.normalize(text))
+
+    def _candidates(self, text):
+        # The text must already be normalized; any slice of it then is too,
+        # so the contexts need only be encoded.
+        #
+        # The standard `re` module has no overlapped search, so each search
+        # resumes one character past the start of the previous match.
+        match = self._candidate_regex.search(text)
+        while match:
             (left, boundary, right) = match.groups()
             left_index = match.span()[0] + len(left)
             right_index = left_index + len(boundary)
@@ -75,48 +91,61 @@ class SentenceTokenizer(object):
             yield Candidate(
                 left_index,
                 right_index,
-                SentenceTokenizer.tobytes(left[-left_bound:]),
-                SentenceTokenizer.tobytes(bmatch.group(1)),
-                SentenceTokenizer.tobytes(right[:right_bound]),
+                left[-left_bound:].encode(ENCODING),
+                boundary.encode(ENCODING),
+                right[:right_bound].encode(ENCODING),
             )
+            match = self._candidate_regex.search(text, match.start() + 1)
+
+    @staticmethod
+    def normalize(text):
+        # ASCII text is already normalized under any of the normal forms.
+        if text.isascii():
+            return text
+        return unicodedata.normalize(NORMALIZATION, text)
 
     @staticmethod
     def tobytes(string):
-        return unicodedata.normalize(NORMALIZATION, string).encode(ENCODING)
+        return SentenceTokenizer.normalize(string).encode(ENCODING)
 
     @staticmethod
-    @nlup.tupleify
     def extract_features(candidate):
-        """Generates feature vector for a candidate."""
-        yield BIAS
+        """Computes feature vector for a candidate."""
+        left = candidate.left
+        right = candidate.right
+        features = [BIAS]
         # All suffixes of the left context.
-        lpieces = tuple(
-            b"L=" + candidate.left[-i:]
-            for i in range(1, 1 + len(candidate.left))
-        )
-        yield from lpieces
-        rpieces = tuple(
-            b"R=" + candidate.right[:i]
-            for i in range(1, 1 + len(candidate.right))
-        )
-        yield from rpieces
-        yield from (
-            lpiece + b"^" + rpiece
-            for (lpiece, rpiece) in zip(lpieces, rpieces)
+        features.extend(b"L=" + left[-i:] for i in range(1, 1 + len(left)))
+        # All prefixes of the right context.
+        features.extend(b"R=" + right[:i] for i in range(1, 1 + len(right)))
+        # Composition of the two, reusing the pieces just built.
+        nleft = len(left)
+        features.extend(
+            features[i] + b"^" + features[nleft + i]
+            for i in range(1, 1 + min(nleft, len(right)))
         )
+        return features
+
+    def train(self, vector, label):
+        """Trains on a candidate, returning whether it was correct."""
+        return self._classifier.train(vector, label)
+
+    def average(self):
+        self._classifier.average()
+
+    def predict(self, vector):
+        return self._classifier.predict(vector)
 
     def tokenize(self, text):
         """Generates segmented strings of text."""
+        # Normalizes once up front, so that candidate indices refer to the
+        # text being segmented.
+        text = SentenceTokenizer.normalize(text)
         start = 0
-        for candidate in self.candidates(text):
-            if NEWLINE.match(candidate.boundary):
+        for candidate in self._candidates(text):
+            if candidate.boundary.startswith(NEWLINES):
                 continue
             if self.predict(self.extract_features(candidate)):
                 yield text[start : candidate.left_index]
                 start = candidate.right_index
         yield text[start:].rstrip()
-
-    # Delegates all attributes not otherwise defined to the underlying
-    # classifier.
-    def __getattr__(self, name):
-        return getattr(self._classifier, name)
@@ -280,6 +280,42 @@ cdef class SparseBinomialModel(object):
         cdef vector[string] fvector = tobytevector(feats)
         return self._model.get().Train(fvector, label)
 
+    cpdef size_t train_batch(self, feats_list, labels) except *:
+        """
+        train_batch(feats_list, labels)
+
+        Trains model using a batch of labeled observations.
+
+        This method trains the internal model on each labeled observation in
+        turn, exactly as repeated calls to `train` would, but converts the
+        whole batch at once and updates without returning to Python.
+
+        Args:
+            feats_list: An iterable of iterables of string features, one for
+                each observation.
+            labels: An iterable of boolean labels, one for each observation.
+
+        Returns:
+            The number of observations in the batch correctly labeled.
+
+        Raises:
+            PerceptronixOpError: Model already averaged.
+            ValueError: Batch sizes do not match.
+        """
+        if self._model.get().Averaged():
+            raise PerceptronixOpError("Model already averaged")
+        cdef vector[vector[string]] fvectors = tobytevectors(feats_list)
+        cdef vector[bool] ys = labels
+        if fvectors.size() != ys.size():
+            raise ValueError(
+                f"Batch sizes do not match: {fvectors.size()} != {ys.size()}"
+            )
+        cdef size_t correct = 0
+        cdef size_t i
+        for i in range(fvectors.size()):
+            correct += self._model.get().Train(fvectors[i], ys[i])
+        return correct
+
     @property
     def averaged(self):
         return self._model.get().Averaged()
@@ -1,4 +1,7 @@
-from typing import Iterable, List, Tuple
+from typing import Iterable, List, Tuple, Union
+
+# Sparse features may be given either as strings or as UTF-8 bytestrings.
+_Feature = Union[str, bytes]
 
 class PerceptronixIOError(OSError): ...
 class PerceptronixOpError(RuntimeError): ...
@@ -31,6 +34,11 @@ class SparseBinomialModel:
     @classmethod
     def read(cls, filename: str) -> Tuple[SparseBinomialModel, str]: ...
     def train(self, feats: Iterable[str], label: bool) -> bool: ...
+    def train_batch(
+        self,
+        feats_list: Iterable[Iterable[_Feature]],
+        labels: Iterable[bool],
+    ) -> int: ...
     def write(self, filename: str, metadata: str) -> None: ...
 
 class SparseBinomialSequentialModel:
@@ -63,13 +71,13 @@ class SparseDenseMultinomialSequentialModel:
         self, nfeats: int, nlabels: int, order: int, c: int = ...
     ) -> None: ...
     def average(self) -> None: ...
-    def predict(self, efeats: Iterable[Iterable[str]]) -> List[int]: ...
+    def predict(self, efeats: Iterable[Iterable[_Feature]]) -> List[int]: ...
     @classmethod
     def read(
         cls, filename: str, order: int
     ) -> Tuple[SparseDenseMultinomialSequentialModel, str]: ...
     def train(
-        self, efeats: Iterable[Iterable[str]], labels: Iterable[int]
+        self, efeats: Iterable[Iterable[_Feature]], labels: Iterable[int]
     ) -> int: ...
     def write(self, filename: str, metadata: str) -> None: ...
 
@@ -89,12 +97,12 @@ class SparseMultinomialSequentialModel:
         self, nfeats: int, nlabels: int, order: int, c: int = ...
     ) -> None: ...
     def average(self) -> None: ...
-    def predict(self, efeats: Iterable[Iterable[str]]) -> List[str]: ...
+    def predict(self, efeats: Iterable[Iterable[_Feature]]) -> List[str]: ...
     @classmethod
     def read(
         cls, filename: str, order: int
     ) -> Tuple[SparseMultinomialSequentialModel, str]: ...
     def train(
-        self, efeats: Iterable[Iterable[str]], labels: List[str]
+        self, efeats: Iterable[Iterable[_Feature]], labels: List[str]
     ) -> int: ...
     def write(self, filename: str, metadata: str) -> None: ...
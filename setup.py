@@ -1,9 +1,19 @@
+import os
+
 from setuptools import Extension
 from setuptools import setup
 
 from Cython.Build import cythonize
 
 
+extra_compile_args = ["-std=c++17", "-funsigned-char", "-O3", "-flto"]
+# Tunes the build for a given instruction set (e.g., `native`) when
+# requested; left unset, the build stays portable.
+march = os.environ.get("PERCEPTRONIX_MARCH")
+if march:
+    extra_compile_args.append(f"-march={march}")
+
+
 extension = Extension(
     "_perceptronix",
     sources=[
@@ -14,7 +24,8 @@ extension = Extension(
     ],
     libraries=["protobuf", "pthread"],
     language="c++",
-    extra_compile_args=["-std=c++17", "-funsigned-char"],
+    extra_compile_args=extra_compile_args,
+    extra_link_args=["-flto"],
 )
 
 